@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+
+class BoardHistory():
+    """
+    BoardHistory: holds the boards of the current game, keeping in memory only a bounded amount of them.
+
+    The boards are kept in two structures:
+    - a LRU cache with the most recently used boards, whose size is bounded by cacheSize;
+    - a set of sparse checkpoints: the first board, one board every checkpointInterval generations and
+      every board that was modified by the user (and thus cannot be computed from the previous one).
+    When a generation that is not in the cache is requested we recompute it, starting from the nearest
+    previous checkpoint, through the step function, which is deterministic. As the rule of the game can change
+    during the game, we keep track of the step function in use from each generation on.
+
+    Parameters:
+    step               (callable): function that, given a board, returns the board at the next generation
+    cacheSize               (int): maximum amount of boards in the LRU cache
+    checkpointInterval      (int): amount of generations between two consecutive checkpoints
+
+    """
+
+    def __init__(self, step, cacheSize=200, checkpointInterval=50):
+        """ Creates an history that holds just the first board, which is empty """
+        self.cacheSize = cacheSize
+        self.checkpointInterval = checkpointInterval
+        self.reset(step)
+
+    def reset(self, step, board=None):
+        """ Clears the history, which will hold only the given board (an empty one by default): the given step function
+        becomes the one of the whole history """
+        self.steps = [(0, step)]  # [(generation, step)]: the step function in use from generation on
+        self.cache = OrderedDict()  # {generation: board}, ordered from the least to the most recently used
+        self.checkpoints = {}  # {generation: board}
+        self.length = 0
+        self.append({} if board is None else board)
+
+    def load(self, boards, step):
+        """ Loads a list of boards computed with the given step function: the boards that cannot be computed from
+        the previous one are kept as checkpoints """
+        self.reset(step, boards[0])
+        for previous, board in zip(boards, boards[1:]):
+            if BoardHistory.sameBoard(step(previous), board):
+                self.append(board)
+            else:
+                self.pin(self.length, board)
+
+    def toList(self):
+        """ Returns the list of all the boards in the history, recomputing the ones that are not in memory """
+        return [self.get(gen) for gen in range(self.length)]
+
+    def __len__(self):
+        """ Amount of generations in the history """
+        return self.length
+
+    def get(self, gen):
+        """ Returns the board at the given generation: from the cache if available, otherwise it is recomputed
+        from the nearest previous checkpoint """
+        assert 0 <= gen < self.length
+        if gen in self.cache:
+            self.cache.move_to_end(gen)
+            return self.cache[gen]
+
+        # the nearest previous board in memory, either a checkpoint or a cached board
+        start = max([g for g in self.checkpoints.keys() if g <= gen] + [g for g in self.cache.keys() if g <= gen])
+        board = self.cache[start] if start in self.cache else self.checkpoints[start]
+        for g in range(start + 1, gen + 1):
+            board = self.stepAt(g - 1)(board)
+            if g % self.checkpointInterval == 0:
+                self.checkpoints[g] = board
+        self.__cache(gen, board)
+        return board
+
+    def append(self, board):
+        """ Adds a board as the next generation of the history """
+        gen = self.length
+        self.length += 1
+        if gen % self.checkpointInterval == 0:
+            self.checkpoints[gen] = board
+        self.__cache(gen, board)
+
+    def truncate(self, gen):
+        """ Removes all the generations after the given one """
+        self.length = min(self.length, gen + 1)
+        for g in [g for g in self.cache.keys() if g > gen]:
+            del self.cache[g]
+        for g in [g for g in self.checkpoints.keys() if g > gen]:
+            del self.checkpoints[g]
+        self.steps = [(g, step) for (g, step) in self.steps if g <= gen] or self.steps[:1]
+
+    def stepAt(self, gen):
+        """ Returns the step function that computes the generation after the given one """
+        return [step for (g, step) in self.steps if g <= gen][-1]
+
+    def setStep(self, gen, step):
+        """ Removes all the generations after the given one, and sets the step function to compute the following ones """
+        self.truncate(gen)
+        if self.stepAt(gen) is not step:
+            self.steps = [(g, s) for (g, s) in self.steps if g < gen] + [(gen, step)]
+
+    def pin(self, gen, board):
+        """ Sets the board at the given generation as a checkpoint, since it was modified and cannot be recomputed:
+        the following generations are removed, as they were computed from the previous version of the board,
+        whilst the step function in use from this generation on is kept """
+        steps = [(g, step) for (g, step) in self.steps if g <= gen]
+        self.truncate(gen - 1)
+        self.steps = steps
+        self.length = gen + 1
+        self.checkpoints[gen] = board
+        self.__cache(gen, board)
+
+    def __cache(self, gen, board):
+        """ Puts the board in the LRU cache, evicting the least recently used board if the cache is full """
+        self.cache[gen] = board
+        self.cache.move_to_end(gen)
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+    @staticmethod
+    def sameBoard(a, b):
+        """ Utility method to check if two boards hold the same cells in the same states """
+        return a.keys() == b.keys() and \
+            all(a[k].getState() == b[k].getState() and a[k].getAge() == b[k].getAge() for k in a.keys())
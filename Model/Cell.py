@@ -5,14 +5,22 @@ class Cell():
     Parameters:
     i,j    (int): position of the Cell
     state  (str): either "Alive", "Dead" or "Born"
+    age    (int): for a "Dead" cell, the amount of generations since it died (starting from 1), 0 otherwise
 
     """
 
-    def __init__(self, i, j, state="Born"):
+    def __init__(self, i, j, state="Born", age=0):
         """ Initialize the attributes """
         self.i = i
         self.j = j
         self.state = state
+        self.age = age
+
+    def __setstate__(self, state):
+        """ Cells saved before the age was introduced are loaded with the age they would have had """
+        self.__dict__.update(state)
+        if "age" not in state:
+            self.age = 1 if self.state == "Dead" else 0
 
     def setState(self, state):
         """ Setter of the state of the Cell """
@@ -23,6 +31,10 @@ class Cell():
         """ Getter of the state of the Cell """
         return self.state
 
+    def getAge(self):
+        """ Getter of the age of the Cell """
+        return self.age
+
     def copy(self):
         """ Copy constructor of the Cell """
-        return Cell(self.i, self.j, self.state)
+        return Cell(self.i, self.j, self.state, self.age)
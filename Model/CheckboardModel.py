@@ -1,10 +1,12 @@
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
-from scipy import signal
 import numpy as np
 import pickle
+from functools import partial
 
 from Model.Cell import Cell
+from Model.BoardHistory import BoardHistory
 from Model.GameColors import GameColors
+from Model.Rule import PRESETS, findRule
 
 
 class CheckboardModel(QObject):
@@ -13,42 +15,54 @@ class CheckboardModel(QObject):
     In our MVC this is the Model.
 
     Main Attributes:
-    boardHistory      (list): holds all the boards that were displayed in the current game. Each board is a dictionary,
+    boardHistory (BoardHistory): holds the boards of the current game. Each board is a dictionary,
                               in which the keys are tuples (i,j): if the key (i,j) is in the dictionary it means
                               that such position is not empty, and the cell status is in the CurrentBoard[(i,j)],
-                              which is an object of Cell() type.
+                              which is an object of Cell() type. Only a bounded amount of boards is kept in memory,
+                              the others are recomputed on demand from sparse checkpoints.
 
     currentIndex       (int): integer that holds the index of the boardHistory that contains the board which is displayed now.
 
-    countMatrix (np.ndarray): numpy matrix that is used to count the neighbors, in order to get the next board in the board history.
-                              Its dimensions are (maxX,maxY) because we consider a finite board in this implementation. As it is
-                              not possible to scroll the view, we cannot draw cells outside of the (maxX,maxY), and any computation
-                              that would lead to a new cell outside of the boundaries is not considered.
+    maxX, maxY         (int): dimensions of the universe. We consider a finite board in this implementation: we cannot draw
+                              cells outside of the (maxX,maxY), and any computation that would lead to a new cell outside of the
+                              boundaries is not considered. The neighbors are counted only around the cells, so the cost of the
+                              simulation depends on the amount of cells and not on the size of the universe nor on how far
+                              apart the cells are.
 
     colors      (GameColors): object that holds the colors of the cells in the QGraphicsView.
 
+    rule              (Rule): rule of the Generations family in use, Conway's Life ("23/3/2") by default. A "Dead" cell
+                              goes through rule.states-1 ages before disappearing: all but the last one are dying states,
+                              the last one is just shown as the marker of a cell that died, and a new cell can be born there.
+
     Other attributes' details are offered in the __init__() implementation.
     """
 
     boardUpdate = pyqtSignal()  # signal to notify the board content has changed
     colorUpdate = pyqtSignal()  # signal to notify an interface color of the board has changed
     cellSizeUpdate = pyqtSignal()  # signal to notify the cellSize on the board has changed
+    ruleUpdate = pyqtSignal()  # signal to notify the rule of the game has changed
 
-    def __init__(self, cellSize=15, cellSizeLB=4, cellSizeUB=100, maxX=370, maxY=220, speed=10, minSpeed=2, maxSpeed=30):
+    def __init__(self, cellSize=15, cellSizeLB=4, cellSizeUB=100, maxX=10000, maxY=10000, speed=10, minSpeed=2, maxSpeed=30,
+                 cacheSize=200, checkpointInterval=50, rule="23/3/2"):
         """ Creates all the attributes needed for the app to run """
         super().__init__()
-        self.cellSize = cellSize  # current cell size in the view (in pixels)
-        self.cellSizeLB = cellSizeLB  # cell size Lower Bound
+        self.cellSize = cellSize  # current cell size in the view (in pixels), i.e. the scale of the view
+        self.cellSizeLB = cellSizeLB  # cell size Lower Bound for the Cell Size input: zooming out can go below it
         self.cellSizeUB = cellSizeUB  # cell size Upper Bound
 
-        self.boardHistory = []  # history of the boards of the current game
-        self.boardHistory.append({})  # the first board is empty: an empty dict.
-        self.currentIndex = 0
-
-        # countMatrix to count efficiently the neighbors
+        # dimensions of the universe
         self.maxX = maxX
         self.maxY = maxY
-        self.countMatrix = np.zeros((self.maxX, self.maxY))
+
+        # rule of the game and step function, which computes the next board with such rule
+        self.rule = findRule(rule)
+        self.step = partial(self.__computeNext, rule=self.rule)
+
+        # history of the boards of the current game: the first board is empty, and the following ones are computed
+        # through the step function, which is used as well to recompute the boards evicted from the history
+        self.boardHistory = BoardHistory(self.step, cacheSize, checkpointInterval)
+        self.currentIndex = 0
 
         self.colors = GameColors()  # holds the colors of the view and exposes primitives to handle those
 
@@ -73,25 +87,39 @@ class CheckboardModel(QObject):
         """ Method to observe (from outside) when the cellSize is updated """
         self.cellSizeUpdate.connect(slot)
 
+    def observeRule(self, slot):
+        """ Method to observe (from outside) when the rule is updated """
+        self.ruleUpdate.connect(slot)
+
     # SAVE/LOAD
     def saveGame(self, filename):
-        """ Save the current game to .gol file. We just write the boardHistory to file """
+        """ Save the current game to .gol file. We write to file the rule in use (in "S/B/C" notation)
+        together with the list of boards in the boardHistory """
         if filename != "":
             with open(filename + '.gol', 'wb') as f:
-                pickle.dump(self.boardHistory, f)
+                pickle.dump({"rule": self.rule.toString(), "boards": self.boardHistory.toList()}, f)
 
     def loadGame(self, filename):
-        """ Load a game from a file: we load the boardHistory and emit that the board has changed """
+        """ Load a game from a file: we load the rule and the boardHistory and emit that those have changed.
+        Files holding just the list of boards were saved before rules could be selected, so they use Conway's Life """
         if filename != "":
             with open(filename, 'rb') as f:
-                self.boardHistory = pickle.load(f)
+                game = pickle.load(f)
+                if not isinstance(game, dict):
+                    game = {"rule": "23/3/2", "boards": game}
+                self.rule = findRule(game["rule"])
+                self.step = partial(self.__computeNext, rule=self.rule)
+                self.boardHistory.load(game["boards"], self.step)
                 self.currentIndex = 0
+                self.ruleUpdate.emit()
+                self.colorUpdate.emit()
                 self.boardUpdate.emit()
 
     # CELL SIZE
     def setCellSize(self, cellSize):
-        """ Called when a new cellSize is selected: we make sure that the selected value respects the bounds and we emit the corresponding signal """
-        assert self.cellSizeLB <= cellSize and cellSize <= self.cellSizeUB
+        """ Called when a new cellSize is selected: we make sure that the selected value respects the upper bound and we emit the corresponding signal.
+        The lower bound is not enforced here, as zooming out the view can show more than one cell per pixel """
+        assert 0 < cellSize and cellSize <= self.cellSizeUB
         self.cellSize = cellSize
         self.cellSizeUpdate.emit()
 
@@ -107,6 +135,15 @@ class CheckboardModel(QObject):
         """ Getter for cellSize upper bound """
         return self.cellSizeUB
 
+    # UNIVERSE SIZE
+    def getMaxX(self):
+        """ Getter for the width of the universe (in cells) """
+        return self.maxX
+
+    def getMaxY(self):
+        """ Getter for the height of the universe (in cells) """
+        return self.maxY
+
     # VIEW COLORS
     def setColor(self, key, value):
         """ When a new color is picked for a certain cell-state we delegate the GameColor() object to update, and we notify who observe such changes """
@@ -117,86 +154,167 @@ class CheckboardModel(QObject):
         """ Returns the current color of the given key through delegation to GameColor() """
         return self.colors.getColor(key)
 
+    def getCellColor(self, state, age):
+        """ Returns the current color of a cell with the given state and age, considering the amount of states of the rule """
+        return self.colors.getCellColor(state, age, self.rule.getStates())
+
+    # RULE
+    def setRule(self, rule):
+        """ When a new rule is selected the future configurations are removed from the history, as they were computed
+        with the previous rule. We notify both the board and the colors, as the gradient of the "Dead" cells changes """
+        self.rule = rule
+        self.step = partial(self.__computeNext, rule=self.rule)
+        self.boardHistory.setStep(self.currentIndex, self.step)
+        self.ruleUpdate.emit()
+        self.colorUpdate.emit()
+        self.boardUpdate.emit()
+
+    def getRule(self):
+        """ Getter for the rule in use """
+        return self.rule
+
+    def getRules(self):
+        """ Getter for the well known rules that can be selected """
+        return PRESETS
+
     # BOARD MANAGEMENT
     def getBoard(self):
         """ Returns the current board so we can render it """
-        return self.boardHistory[self.currentIndex]
+        return self.boardHistory.get(self.currentIndex)
+
+    def getBoards(self, start, end):
+        """ Generator of the boards from generation start to end (both included): the ones in the history are taken from
+        there, the ones after the last generation are computed on the fly without being added to the history """
+        assert 0 <= start <= end
+        last = len(self.boardHistory) - 1
+        for gen in range(start, min(end, last) + 1):
+            yield self.boardHistory.get(gen)
+        if end > last:
+            board = self.boardHistory.get(last)
+            for gen in range(last + 1, end + 1):
+                board = self.step(board)
+                if gen >= start:
+                    yield board
 
     def addCell(self, i, j):
         """ Adds a new Cell() to the current board, considering the cases of empty position and the one where the Cell is "Dead" """
-        if (i, j) not in self.boardHistory[self.currentIndex].keys():
-            self.boardHistory[self.currentIndex][(i, j)] = Cell(i, j)
-            self.boardUpdate.emit()
-        elif self.boardHistory[self.currentIndex][(i, j)].getState() == "Dead":
-            self.boardHistory[self.currentIndex][(i, j)] = Cell(i, j)
-            self.boardUpdate.emit()
+        self.addCells([(i, j)])
 
     def removeCell(self, i, j):
         """ Removes a cell in position (i,j) if this is in the current board """
-        if (i, j) in self.boardHistory[self.currentIndex].keys():
-            del self.boardHistory[self.currentIndex][(i, j)]
+        self.removeCells([(i, j)])
+
+    def addCells(self, positions):
+        """ Adds a batch of Cell() to the current board: the board update is notified only once for the whole batch,
+        and only if at least one position has actually changed. As the board is modified, the future configurations
+        are removed from the history """
+        board = self.boardHistory.get(self.currentIndex)
+        changed = False
+        for (i, j) in positions:
+            if (i, j) not in board.keys() or board[(i, j)].getState() == "Dead":
+                board[(i, j)] = Cell(i, j)
+                changed = True
+        if changed:
+            self.boardHistory.pin(self.currentIndex, board)
+            self.boardUpdate.emit()
+
+    def removeCells(self, positions):
+        """ Removes a batch of cells from the current board, notifying a single board update for the whole batch """
+        board = self.boardHistory.get(self.currentIndex)
+        changed = False
+        for (i, j) in positions:
+            if (i, j) in board.keys():
+                del board[(i, j)]
+                changed = True
+        if changed:
+            self.boardHistory.pin(self.currentIndex, board)
             self.boardUpdate.emit()
 
     def next(self):
         """ Board update logic: creates the board at the next iteration in the Game of Life simulation """
 
         """ Manage the boardHistory: if we go back in the timeline and press play we want all the future steps to be evaluated from
-        the beginning, thus removing the future configurations """
-        if self.currentIndex + 1 < len(self.boardHistory):
-            self.boardHistory = self.boardHistory[0:self.currentIndex + 1]
-
-        updatedBoard = {}  # new board (empty at the beginning)
-
-        cm = self.__countNeighbors()  # matrix holding in [i,j] the neighborhood count of the cell in position (i,j)
-        x, y = np.nonzero(cm)  # we take only the non-zero values of such count matrix, as those only will be new cells
-        nonZero = set([e for e in zip(x, y)])
-        previous = set(self.boardHistory[self.currentIndex].keys())
-
-        """ The positions (i, j) to be checked are the ones that have a neighbor count > 0 or
-        that previously where not empty. In this way we cycle over less positions (i,j) """
-        toBeChecked = nonZero.union(previous)
-
-        for s in toBeChecked:
-            i = s[0]
-            j = s[1]
-            count = cm[i, j]
-
-            if (i, j) in self.boardHistory[self.currentIndex].keys() and self.boardHistory[self.currentIndex][(i, j)].getState() != "Dead":
-                # we're considering here the case of (i,j) was in the previous board and not "Dead"
-                if count <= 1:
-                    # dies because of loneliness
-                    updatedBoard[(i, j)] = self.boardHistory[self.currentIndex][(i, j)].copy()
-                    updatedBoard[(i, j)].setState("Dead")
-                elif count >= 4:
-                    # dies because of overpopulation
-                    updatedBoard[(i, j)] = self.boardHistory[self.currentIndex][(i, j)].copy()
-                    updatedBoard[(i, j)].setState("Dead")
-                else:
-                    # lives if count = 2 or 3
-                    updatedBoard[(i, j)] = self.boardHistory[self.currentIndex][(i, j)].copy()
-                    updatedBoard[(i, j)].setState("Alive")
-
-            else:
-                # Here we're considering a (i,j) that is not in the previous board or it was "Dead"
-                if count == 3:
-                    # a new cell is born
-                    updatedBoard[(i, j)] = Cell(i, j)
+        the beginning, thus removing the future configurations, and computing them with the rule in use """
+        self.boardHistory.setStep(self.currentIndex, self.step)
 
-        self.boardHistory.append(updatedBoard)
+        self.boardHistory.append(self.step(self.boardHistory.get(self.currentIndex)))
         self.currentIndex += 1
         self.boardUpdate.emit()
 
-    def __countNeighbors(self):
-        """ Utility method to count the amount of neighbors of each cell: starting from an empty countMatrix
-        we place a 1 on each position that has a Cell not "Dead", then we use convolution over such matrix to count
-        the amount of neighbors in the 8 adjacent cells for each position. Doing so we get a matrix which is returned """
+    def __computeNext(self, board, rule):
+        """ Computes the board at the next iteration from the given one with the given rule. It does not depend on any
+        other state, so that the boards evicted from the history can be recomputed deterministically.
+        The board is converted into an array of states, which is advanced at once through a vectorized transition,
+        then the array is converted back into a board """
 
-        self.countMatrix = self.countMatrix * 0
-        for key, cell in self.boardHistory[self.currentIndex].items():
-            if cell.getState() != "Dead" and key[0] < self.maxX and key[1] < self.maxY:
-                self.countMatrix[key[0], key[1]] = 1
+        positions, states = self.__toStates(board)
+        positions, states, updatedStates = self.__transition(positions, states, rule)
 
-        return signal.convolve2d(self.countMatrix, [[1, 1, 1], [1, 0, 1], [1, 1, 1]], 'same')
+        updatedBoard = {}  # new board (empty at the beginning)
+
+        # we take only the non-zero states, as the other positions are empty
+        nonZero = np.nonzero(updatedStates)[0]
+        for position, state, previous in zip(positions[nonZero].tolist(), updatedStates[nonZero].tolist(),
+                                             states[nonZero].tolist()):
+            i, j = divmod(position, self.maxY)
+            if state == 1:
+                # the cell is "Alive" if it was already alive, otherwise it is "Born"
+                updatedBoard[(i, j)] = Cell(i, j, "Alive" if previous == 1 else "Born")
+            else:
+                # the cell is "Dead" since state-1 generations
+                updatedBoard[(i, j)] = Cell(i, j, "Dead", state - 1)
+
+        return updatedBoard
+
+    def __toStates(self, board):
+        """ Utility method to convert a board into two arrays: the positions of the cells, each one encoded as the
+        integer i*maxY+j, and their states as small integers: 1 for cells not "Dead" and age+1 for "Dead" cells.
+        The cells outside of the (maxX,maxY) boundaries are not considered """
+
+        positions = []
+        states = []
+        for key, cell in board.items():
+            if 0 <= key[0] < self.maxX and 0 <= key[1] < self.maxY:
+                positions.append(key[0] * self.maxY + key[1])
+                states.append(min(cell.getAge() + 1, 255) if cell.getState() == "Dead" else 1)
+        return np.array(positions, dtype=np.int64), np.array(states, dtype=np.uint8)
+
+    def __transition(self, positions, states, rule):
+        """ Utility method to compute the next states: we count the amount of neighbors only around the alive cells,
+        shifting their coordinates in the 8 adjacent directions and counting how many times each position appears,
+        so that the cost depends on the amount of cells and not on how far apart they are. Then we apply the rule
+        to all the positions at once, through its lookup tables. Returns the positions to be considered (the cells
+        and their neighbors) together with their previous and next states """
+
+        xs, ys = np.divmod(positions[states == 1], self.maxY)
+        neighbors = []
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                nx, ny = xs + dx, ys + dy
+                inside = (0 <= nx) & (nx < self.maxX) & (0 <= ny) & (ny < self.maxY)
+                neighbors.append(nx[inside] * self.maxY + ny[inside])
+        neighbors, counts = np.unique(np.concatenate(neighbors), return_counts=True)
+
+        # all the positions that can be non-empty at the next iteration, sorted, with their state and neighbor count
+        allPositions = np.union1d(positions, neighbors)
+        previous = np.zeros(allPositions.size, dtype=np.uint8)
+        previous[np.searchsorted(allPositions, positions)] = states
+        count = np.zeros(allPositions.size, dtype=np.int64)
+        count[np.searchsorted(allPositions, neighbors)] = counts
+
+        n = rule.getStates()
+        alive = previous == 1
+
+        survive = alive & rule.survivalTable[count]
+        birth = ((previous == 0) | (previous >= n)) & rule.birthTable[count]  # dying cells cannot be born again
+
+        updatedStates = np.where(previous >= 2, previous + 1, 0).astype(np.uint8)  # "Dead" cells age
+        updatedStates[updatedStates > n] = 0  # the last age is over: the position becomes empty
+        updatedStates[alive & ~survive] = 2  # the cell dies
+        updatedStates[survive | birth] = 1
+        return allPositions, previous, updatedStates
 
     # SIMULATION METHODS
     def goBack(self):
@@ -222,13 +340,26 @@ class CheckboardModel(QObject):
         self.running = False
         self.timer.stop()
 
+    def goTo(self, gen):
+        """ Method to jump to the given configuration in the game history """
+        assert 0 <= gen < len(self.boardHistory)
+        self.currentIndex = gen
+        self.boardUpdate.emit()
+
     def reset(self):
         """ Method to reset the simulation, clearing the history """
-        self.boardHistory = []
-        self.boardHistory.append({})
+        self.boardHistory.reset(self.step)
         self.currentIndex = 0
         self.boardUpdate.emit()
 
+    def getGeneration(self):
+        """ Getter of the generation of the configuration which is displayed now """
+        return self.currentIndex
+
+    def getLastGeneration(self):
+        """ Getter of the last generation available in the game history """
+        return len(self.boardHistory) - 1
+
     def getLeftEnabled(self):
         """ Getter of the state of the Arrow-Left navigation button: if there is no previous state it has to be inactive """
         if self.currentIndex == 0:
@@ -8,6 +8,10 @@ class GameColors():
     Attributes:
     colors    (dict): the keys are the status of a cell (either "Alive", "Dead" or "Born"),
                       the values are the QColor() associated to that status, which will be used in the View.
+    gradients (dict): cache of the gradients of the "Dead" color, the keys are the amount of states of the rule.
+
+    In rules with more than two states a "Dead" cell goes through several states while aging: those are colored
+    with a gradient palette, indexed by the age of the cell, that fades the "Dead" color into the black background.
 
     """
 
@@ -16,13 +20,32 @@ class GameColors():
         self.colors = {"Alive": QColor("white"),
                        "Dead": QColor("red"),
                        "Born": QColor("blue")}
+        self.gradients = {}
 
     def setColor(self, key, value):
         """ Setter for the color associated to the key """
         assert key in self.colors.keys() and type(value) == QColor
         self.colors[key] = value
+        self.gradients.clear()  # the gradients have to be computed again from the new colors
 
     def getColor(self, key):
         """ Getter for the color associated to the key """
         assert key in self.colors.keys()
         return self.colors[key]
+
+    def getGradient(self, states):
+        """ Returns the gradient palette of the "Dead" color for a rule with the given amount of states: the color in
+        position k is the one of a cell that died k+1 generations ago """
+        if states not in self.gradients:
+            dead = self.colors["Dead"]
+            steps = states - 1  # ages of a "Dead" cell go from 1 to states-1
+            self.gradients[states] = [QColor(dead.red() * (steps - k) // steps,
+                                             dead.green() * (steps - k) // steps,
+                                             dead.blue() * (steps - k) // steps) for k in range(steps)]
+        return self.gradients[states]
+
+    def getCellColor(self, state, age, states):
+        """ Getter for the color of a cell given its state and age, in a rule with the given amount of states """
+        if state == "Dead":
+            return self.getGradient(states)[min(age, states - 1) - 1]  # older cells come from rules with more states
+        return self.getColor(state)
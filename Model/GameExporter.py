@@ -0,0 +1,124 @@
+import os
+import importlib.util
+import numpy as np
+from PyQt5.QtGui import QImage
+
+
+class GameExporter():
+    """
+    GameExporter: renders a range of generations of the game to image frames and writes them to file.
+    The frames are rendered straight from the boards of the model into numpy arrays (no QGraphicsScene is involved),
+    with the colors of the GameColors palette, and are passed one by one to the writer, so that the export can
+    run without any window, much faster than the simulation speed. PNG sequences and videos are streamed to disk,
+    whilst Pillow holds all the frames of an animated GIF in memory until the file is written.
+
+    The output format is selected through the extension of the file:
+    .gif          -> animated GIF (requires Pillow, frames are kept in memory)
+    .png          -> sequence of PNG files, named <name>_<generation>.png
+    anything else -> video file, e.g. .mp4 or .avi (requires imageio with its ffmpeg plugin, imageio-ffmpeg)
+
+    Parameters:
+    model (CheckboardModel): the model, to get the boards and the colors of the game
+    cellSize          (int): side of each cell in the frames (in pixels)
+    fps               (int): frames per second of the animated GIF and video files
+
+    """
+
+    def __init__(self, model, cellSize=4, fps=10):
+        """ Initialize the attributes """
+        assert cellSize >= 1 and fps >= 1
+        self.model = model
+        self.cellSize = cellSize
+        self.fps = fps
+
+    @staticmethod
+    def availableFormats():
+        """ Returns the extensions of the formats that can be exported with the packages which are installed """
+        formats = [".png"]
+        if importlib.util.find_spec("PIL") is not None:
+            formats.append(".gif")
+        if importlib.util.find_spec("imageio") is not None and importlib.util.find_spec("imageio_ffmpeg") is not None:
+            formats.append(".mp4")
+        return formats
+
+    def export(self, filename, start, end, region, progress=None):
+        """ Exports the generations from start to end (both included) to filename. The region is a tuple (x0, y0, x1, y1)
+        of the part of the board to be rendered (x1 and y1 excluded). The optional progress function is called with the
+        generation of each frame before it is rendered: if it returns False the export stops there, and the file holds
+        the frames rendered so far """
+        frames = self.frames(start, end, region, progress)
+
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == ".gif":
+            self.__writeGif(filename, frames)
+        elif extension == ".png":
+            self.__writePng(filename, frames, start)
+        else:
+            self.__writeVideo(filename, frames)
+
+    def boundingBox(self, board, margin=0):
+        """ Returns the bounding box (x0, y0, x1, y1) of the cells of a board (x1 and y1 excluded), enlarged by margin
+        cells on each side and clipped to the universe: a cheap region for cells that do not travel far """
+        if len(board) == 0:
+            return (0, 0, 1, 1)  # no cells at all: a single empty cell
+        xs, ys = np.array(list(board.keys())).T
+        return (max(int(xs.min()) - margin, 0), max(int(ys.min()) - margin, 0),
+                min(int(xs.max()) + 1 + margin, self.model.getMaxX()), min(int(ys.max()) + 1 + margin, self.model.getMaxY()))
+
+    def frames(self, start, end, region, progress=None):
+        """ Generator of the frames from generation start to end (both included): each frame is a numpy RGB image """
+        for gen, board in enumerate(self.model.getBoards(start, end), start):
+            if progress is not None and not progress(gen):
+                return
+            yield self.renderFrame(board, region)
+
+    def renderFrame(self, board, region):
+        """ Renders a board into a numpy RGB image: first one pixel per cell, which is then scaled to the cell size """
+        x0, y0, x1, y1 = region
+        pixels = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)  # black background, as in the GameGrid
+
+        positions = {}  # {(state, age): [(i,j), ...]} so that each color is set at once
+        for indexes, cell in board.items():
+            if x0 <= indexes[0] < x1 and y0 <= indexes[1] < y1:
+                positions.setdefault((cell.getState(), cell.getAge()), []).append(indexes)
+
+        for (state, age), indexes in positions.items():
+            color = self.model.getCellColor(state, age)
+            xs, ys = np.array(indexes).T
+            pixels[ys - y0, xs - x0] = (color.red(), color.green(), color.blue())
+
+        return pixels.repeat(self.cellSize, axis=0).repeat(self.cellSize, axis=1)
+
+    def __writeGif(self, filename, frames):
+        """ Writes the frames to an animated GIF through Pillow, which keeps all of them in memory until the end """
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("Pillow is required to export animated GIFs")
+
+        first = next(frames, None)
+        if first is None:
+            return  # the export was stopped before the first frame
+        first = Image.fromarray(first)
+        first.save(filename, save_all=True, append_images=(Image.fromarray(f) for f in frames),
+                   duration=1000 / self.fps, loop=0)
+
+    def __writePng(self, filename, frames, start):
+        """ Writes each frame to a PNG file through QImage, numbering the files with the generation """
+        name = os.path.splitext(filename)[0]
+        for gen, frame in enumerate(frames, start):
+            height, width = frame.shape[0], frame.shape[1]
+            image = QImage(frame.tobytes(), width, height, 3 * width, QImage.Format_RGB888)
+            if not image.save(name + "_" + str(gen).zfill(5) + ".png"):
+                raise OSError("Cannot write " + name + "_" + str(gen).zfill(5) + ".png")
+
+    def __writeVideo(self, filename, frames):
+        """ Writes the frames to a video file through imageio """
+        try:
+            import imageio
+        except ImportError:
+            raise ImportError("imageio (with imageio-ffmpeg) is required to export videos")
+
+        with imageio.get_writer(filename, fps=self.fps) as writer:
+            for frame in frames:
+                writer.append_data(frame)
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+class Rule():
+    """
+    Rule: holds a rule of the Generations family, written as "S/B/C" (e.g. Conway's Life is "23/3/2")
+
+    The states of a position are: 0 (empty), 1 (alive) and 2..C-1 (dying). An alive cell survives if its amount of
+    alive neighbors is in S, otherwise it starts dying; an empty position becomes alive if its amount of alive neighbors
+    is in B. A dying cell ages by one state each generation, and can neither be born again nor counted as a neighbor,
+    until it disappears. Conway's Life is the case C=2, in which a cell dies immediately.
+
+    Parameters:
+    survive  (set): amounts of alive neighbors for which an alive cell survives
+    birth    (set): amounts of alive neighbors for which an empty position becomes alive
+    states   (int): amount of states C, counting the empty and the alive ones
+    name     (str): name of the rule shown to the user
+
+    """
+
+    def __init__(self, survive, birth, states=2, name=""):
+        """ Initialize the attributes """
+        assert set(survive) <= set(range(9)) and set(birth) <= set(range(9))
+        assert 2 <= states <= 254  # states are stored in uint8 arrays, together with the "Dead" marker
+        self.survive = set(survive)
+        self.birth = set(birth)
+        self.states = states
+        self.name = name if name != "" else self.toString()
+
+        # lookup tables indexed by the amount of alive neighbors, to apply the rule to a whole count matrix at once
+        self.survivalTable = np.isin(np.arange(9), list(self.survive))
+        self.birthTable = np.isin(np.arange(9), list(self.birth))
+
+    @staticmethod
+    def fromString(rule, name=""):
+        """ Creates a Rule from its "S/B/C" notation: C can be omitted for two-state rules """
+        parts = rule.split("/")
+        assert len(parts) in [2, 3] and all(p.isdigit() or p == "" for p in parts), "Rule has to be in S/B/C notation"
+        states = int(parts[2]) if len(parts) == 3 else 2
+        return Rule([int(n) for n in parts[0]], [int(n) for n in parts[1]], states, name)
+
+    def toString(self):
+        """ Returns the "S/B/C" notation of the Rule """
+        return "".join(str(n) for n in sorted(self.survive)) + "/" + \
+               "".join(str(n) for n in sorted(self.birth)) + "/" + str(self.states)
+
+    def getStates(self):
+        """ Getter of the amount of states """
+        return self.states
+
+    def getName(self):
+        """ Getter of the name of the Rule """
+        return self.name
+
+
+# Some well known rules of the Generations family
+PRESETS = [Rule.fromString("23/3/2", "Conway's Life"),
+           Rule.fromString("/2/3", "Brian's Brain"),
+           Rule.fromString("345/2/4", "Star Wars"),
+           Rule.fromString("12/34/3", "Frogs"),
+           Rule.fromString("2/234/5", "Spirals")]
+
+
+def findRule(rule):
+    """ Returns the well known rule with the given "S/B/C" notation, or a new unnamed Rule if it is not one of those """
+    for preset in PRESETS:
+        if preset.toString() == Rule.fromString(rule).toString():
+            return preset
+    return Rule.fromString(rule)
@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QHBoxLayout, QLineEdit, QToolButton, QLabel, QColorDialog
+from PyQt5.QtWidgets import QHBoxLayout, QLineEdit, QToolButton, QLabel, QColorDialog, QComboBox
 from PyQt5.QtGui import QIntValidator
 from PyQt5.QtCore import Qt
 
@@ -6,7 +6,7 @@ from PyQt5.QtCore import Qt
 # 2) ConfigPanel
 class ConfigPanel(QHBoxLayout):
     """
-    ConfigPanel: presents the user Cell Size modification functionality and custom Game Color functionalities
+    ConfigPanel: presents the user Cell Size modification functionality, the selection of the Rule and custom Game Color functionalities
 
     Parameters:
     model (CheckboardModel): the model, in order to make use of primitives to modify Cell Size and Game Colors
@@ -23,11 +23,12 @@ class ConfigPanel(QHBoxLayout):
 
         # Line Edit to manage Cell Size
         self.cellSizeInput = QLineEdit(str(self.model.getCellSize()))  # get from the model the first cell size
-        self.cellSizeInput.setMaxLength(3)
+        self.cellSizeInput.setMaxLength(4)
         self.cellSizeInput.setMinimumSize(50, 30)
         self.cellSizeInput.setMaximumSize(50, 30)
         self.cellSizeInput.setValidator(QIntValidator())  # int only
         self.cellSizeInput.returnPressed.connect(self.enterNewCellSize)  # action triggered on "ENTER"
+        self.model.observeCellSize(self.alignCellSize)  # the cell size can be modified as well zooming the GameGrid
 
         self.addWidget(QLabel("Cell Size:"), alignment=Qt.AlignLeft)
         self.addWidget(self.cellSizeInput, alignment=Qt.AlignLeft)
@@ -39,12 +40,45 @@ class ConfigPanel(QHBoxLayout):
         self.addWidget(self.feedback, alignment=Qt.AlignLeft)
         self.addStretch()
 
+        # Combo Box to select the Rule among the well known ones
+        self.rules = list(self.model.getRules())
+        self.ruleInput = QComboBox()
+        self.ruleInput.addItems([rule.getName() + " (" + rule.toString() + ")" for rule in self.rules])
+        self.alignRule()
+        self.ruleInput.currentIndexChanged[int].connect(self.selectRule)
+        self.model.observeRule(self.alignRule)  # the rule can be modified as well loading a game
+
+        self.addWidget(QLabel("Rule:"), alignment=Qt.AlignRight)
+        self.addWidget(self.ruleInput, alignment=Qt.AlignLeft)
+        self.addStretch()
+
         # Color controllers (3 couples QLabel+ColorButton)
         color_controllers_names = ["Alive", "Dead", "Born"]
         for n in color_controllers_names:
             self.addWidget(QLabel(n + ":"), alignment=Qt.AlignRight)
             self.addWidget(ColorButton(name=n, model=self.model), alignment=Qt.AlignLeft)
 
+    def alignCellSize(self):
+        """ Once the cell size is modified in the model we get notified here, and we show the new value: rounded,
+        or with two decimals when zooming out shows more than one cell per pixel """
+        cellSize = self.model.getCellSize()
+        self.cellSizeInput.setText(str(round(cellSize)) if cellSize >= 1 else "%.2f" % cellSize)
+
+    def alignRule(self):
+        """ Once the rule is updated in the model we get notified here, and we select it in the combo box:
+        a rule that is not among the well known ones (e.g. loaded from a game) is added to those """
+        rule = self.model.getRule()
+        if rule.toString() not in [r.toString() for r in self.rules]:
+            self.rules.append(rule)
+            self.ruleInput.addItem(rule.getName() + " (" + rule.toString() + ")")
+        self.ruleInput.blockSignals(True)  # the rule is selected by the model: we don't have to notify it back
+        self.ruleInput.setCurrentIndex([r.toString() for r in self.rules].index(rule.toString()))
+        self.ruleInput.blockSignals(False)
+
+    def selectRule(self, index):
+        """ Function called when a Rule is selected: we set it in the model """
+        self.model.setRule(self.rules[index])
+
     def enterNewCellSize(self):
         """ Function called when a new Cell Size is entered: if the new value is
         inside the bounds defined in the Model ([4,100] by defoult), we set the new cell size in the model,
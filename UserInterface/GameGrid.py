@@ -1,6 +1,8 @@
+import math
+import numpy as np
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QSizePolicy, QFrame
-from PyQt5.QtGui import QColor, QPen, QBrush
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QBrush, QImage, QPainter, QTransform
+from PyQt5.QtCore import Qt, QTimer, QRectF
 
 
 # 3) GameGrid()
@@ -10,12 +12,25 @@ class GameGrid(QGraphicsView):
 
     Parameters:
     model  (CheckboardModel): the model, in order to make use of primitives to modify Cell Size and Game Colors
-    width  (int): maximum width of the QGraphicsScene
-    height (int): maximum height of the QGraphicsScene
+    tileSize      (int): side (in cells) of the square tiles in which the board is rendered
+    zoomStep    (float): factor applied to the cell size for each step of the mouse wheel
+    flushInterval (int): minimum interval (in ms) between two consecutive flushes of the painted cells to the model
+
+    The QGraphicsScene covers the whole universe of the model, one scene unit per cell: the cell size is the scale
+    of the View, controlled by the mouse wheel (zoom), whilst the View is moved dragging with the middle button (pan).
+    Zooming out the cell size can go below the lower bound of the model (which only holds for the Cell Size
+    input), down to the scale at which the whole universe fits the View.
+    The board is not rendered through items in the scene: it is split into tiles, each one rendered into a cached
+    QImage (one pixel per cell) which is redrawn only when a cell in its tile changes, and only the visible tiles
+    are painted.
+
+    Painting is stroke-based: while the mouse is dragged we interpolate the line between two successive positions,
+    so that no cell is skipped on fast drags, and we accumulate the edits in a pending batch. The batch is sent to
+    the model at most once per frame, so that the board is re-rendered once for many painted cells.
 
     """
 
-    def __init__(self, model, width=1400, height=800, **kwargs):
+    def __init__(self, model, tileSize=64, zoomStep=1.15, flushInterval=16, **kwargs):
         """ Creates the QGraphicsScene (the View) and connects it to the model """
 
         super().__init__(**kwargs)
@@ -23,73 +38,236 @@ class GameGrid(QGraphicsView):
 
         # We've to observe when the model changes in order to keep the View updated
         self.model.observeBoard(self.renderBoard)  # to observe the cells which are added/removed
-        self.model.observeColor(self.renderBoard)  # to observe game colors changings
+        self.model.observeColor(self.renderColors)  # to observe game colors changings
         self.model.observeCellSize(self.changeSizes)  # to observe the cell size selected
 
-        self.width = width
-        self.height = height
         self.cellSize = self.model.getCellSize()
+        self.zoomStep = zoomStep
+
+        # Attributes to handle the tile-based rendering
+        self.tileSize = tileSize
+        self.renderedBoard = {}  # {(i,j): (state, age)} of the last board rendered, to find out which cells have changed
+        self.tileCells = {}  # {(tx,ty): {(i,j): (state, age)}} cells of each non-empty tile
+        self.tileImages = {}  # {(tx,ty): QImage} cache of the rendered tiles
+
+        # Attributes to handle the stroke-based painting
+        self.lastPosition = None  # last (i,j) painted in the current stroke, None if no stroke is in progress
+        self.pendingAdd = set()  # positions to be added to the model at the next flush
+        self.pendingRemove = set()  # positions to be removed from the model at the next flush
+        self.flushTimer = QTimer()  # timer to coalesce the edits: at most one flush per frame
+        self.flushTimer.setSingleShot(True)
+        self.flushTimer.setInterval(flushInterval)
+        self.flushTimer.timeout.connect(self.flushPending)
+
+        self.panPosition = None  # last position of the mouse while panning, None if we're not panning
+        self.shown = False  # the View is moved to the top-left corner of the universe the first time it is shown
 
         # Create the View
         self.scene = QGraphicsScene()
-        self.scene.setSceneRect(0, 0, self.width, self.height)
+        self.scene.setSceneRect(0, 0, self.model.getMaxX(), self.model.getMaxY())
         self.scene.setBackgroundBrush(QBrush(QColor("black")))
 
-        # Some settings on the QGraphicsScene in order to keep the app simple
+        # Some settings on the QGraphicsScene: scrollbars are hidden, as the View is moved through panning
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setScene(self.scene)
         self.setFrameStyle(QFrame.NoFrame)
+        self.setTransform(QTransform.fromScale(self.cellSize, self.cellSize))
 
         self.renderBoard()
 
+    def showEvent(self, event):
+        """ The first time the View is shown we move it to the top-left corner of the universe """
+        if not self.shown:
+            self.shown = True
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().minimum())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().minimum())
+        return super().showEvent(event)
+
     def mousePressEvent(self, event):
-        """ When a mouse key is pressed on the View we call the event handler """
+        """ When a mouse key is pressed on the View a new stroke begins and we call the event handler,
+        unless the middle button is pressed, which starts panning """
+        if event.button() == Qt.MiddleButton:
+            self.panPosition = event.pos()
+            self.setCursor(Qt.ClosedHandCursor)
+            return
+        self.lastPosition = None
         self.eventHandler(event)
         return super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
-        """ When a mouse key is pressed and moved on the View we call the event handler """
+        """ When a mouse key is pressed and moved on the View we call the event handler, or we move the View if panning """
+        if self.panPosition is not None:
+            delta = event.pos() - self.panPosition
+            self.panPosition = event.pos()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            return
         self.eventHandler(event)
         return super().mouseMoveEvent(event)
 
+    def mouseReleaseEvent(self, event):
+        """ When the mouse key is released the stroke ends: the pending edits are sent to the model right away """
+        if event.button() == Qt.MiddleButton:
+            self.panPosition = None
+            self.unsetCursor()
+            return
+        self.lastPosition = None
+        self.flushPending()
+        return super().mouseReleaseEvent(event)
+
+    def wheelEvent(self, event):
+        """ The mouse wheel zooms the View under the mouse modifying the cell size in the model, from the scale at which
+        the whole universe is visible up to the cell size upper bound """
+        factor = self.zoomStep ** (event.angleDelta().y() / 120)
+        cellSize = min(max(self.cellSize * factor, self.minScale()), self.model.getCellSizeUB())
+        if cellSize != self.cellSize:
+            self.model.setCellSize(cellSize)
+
+    def getVisibleRegion(self):
+        """ Returns the region (x0, y0, x1, y1) of the universe which is visible in the View (x1 and y1 excluded) """
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return (max(int(math.floor(rect.left())), 0), max(int(math.floor(rect.top())), 0),
+                min(int(math.ceil(rect.right())), self.model.getMaxX()), min(int(math.ceil(rect.bottom())), self.model.getMaxY()))
+
+    def minScale(self):
+        """ Returns the scale at which the whole universe fits the View (but never above the cell size lower bound) """
+        return min(self.viewport().width() / self.model.getMaxX(), self.viewport().height() / self.model.getMaxY(),
+                   self.model.getCellSizeLB())
+
     def eventHandler(self, event):
         """ When an interaction with the view is performed we gather where the click happened,
         and we have the following effect to the model:
         left-click  -> add a cell
         right-click -> remove a cell
+        The cells on the line between the previous position of the stroke and the current one are affected as well.
         """
-        i = int(event.pos().x() / self.cellSize)
-        j = int(event.pos().y() / self.cellSize)
+        pos = self.mapToScene(event.pos())
+        i = int(math.floor(pos.x()))
+        j = int(math.floor(pos.y()))
         if(event.buttons() == Qt.LeftButton):
-            self.model.addCell(i, j)
+            positions = self.insideUniverse(self.strokePositions(i, j))
+            self.pendingAdd.update(positions)
+            self.pendingRemove.difference_update(positions)
         elif(event.buttons() == Qt.RightButton):
-            self.model.removeCell(i, j)
+            positions = self.insideUniverse(self.strokePositions(i, j))
+            self.pendingRemove.update(positions)
+            self.pendingAdd.difference_update(positions)
+        else:
+            return
+        self.lastPosition = (i, j)
+        if not self.flushTimer.isActive():
+            self.flushTimer.start()
+
+    def insideUniverse(self, positions):
+        """ Filters out the positions that are outside of the universe of the model """
+        return [(i, j) for (i, j) in positions if 0 <= i < self.model.getMaxX() and 0 <= j < self.model.getMaxY()]
+
+    def strokePositions(self, i, j):
+        """ Returns the positions between the last one of the stroke and (i,j), computed with Bresenham's line algorithm.
+        If there is no stroke in progress only (i,j) is returned """
+        if self.lastPosition is None:
+            return [(i, j)]
+
+        x, y = self.lastPosition
+        dx = abs(i - x)
+        dy = -abs(j - y)
+        sx = 1 if x < i else -1
+        sy = 1 if y < j else -1
+        err = dx + dy
+
+        positions = [(x, y)]
+        while (x, y) != (i, j):
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x += sx
+            if e2 <= dx:
+                err += dx
+                y += sy
+            positions.append((x, y))
+        return positions
+
+    def flushPending(self):
+        """ Sends the pending edits to the model as two batches, so that the board update is notified once per batch """
+        self.flushTimer.stop()
+        if self.pendingAdd:
+            positions, self.pendingAdd = self.pendingAdd, set()
+            self.model.addCells(positions)
+        if self.pendingRemove:
+            positions, self.pendingRemove = self.pendingRemove, set()
+            self.model.removeCells(positions)
 
     def renderBoard(self):
         """We get from the model the board to be rendered as a dict:
         if (i, j) is a key, currentBoard[(i, j)] holds the cell and its status,
         otherwise the position (i, j) is empty.
-        We get the colors from the Model, based on the state of the cell, as we need those for the rendering.
+        We compare it with the last rendered board, and we drop from the cache only the images of the tiles
+        where a cell has changed: those will be redrawn the next time they are visible.
         """
-        currentBoard = self.model.getBoard()
-        self.scene.clear()
+        currentBoard = {indexes: (cell.getState(), cell.getAge()) for indexes, cell in self.model.getBoard().items()}
+
+        for indexes in currentBoard.keys() | self.renderedBoard.keys():
+            state = currentBoard.get(indexes)
+            if state == self.renderedBoard.get(indexes):
+                continue
+            tile = (indexes[0] // self.tileSize, indexes[1] // self.tileSize)
+            self.tileImages.pop(tile, None)
+            if state is None:
+                del self.tileCells[tile][indexes]
+                if len(self.tileCells[tile]) == 0:
+                    del self.tileCells[tile]
+            else:
+                self.tileCells.setdefault(tile, {})[indexes] = state
+
+        self.renderedBoard = currentBoard
+        self.viewport().update()
+
+    def renderColors(self):
+        """ When a game color is modified all the tiles have to be redrawn """
+        self.tileImages.clear()
+        self.viewport().update()
+
+    def renderTile(self, tile):
+        """ Renders the cells of a tile into a QImage, one pixel per cell: the empty positions are transparent.
+        We get the colors from the Model, based on the state and age of the cell """
+        colors = {}
+        pixels = np.zeros((self.tileSize, self.tileSize), dtype=np.uint32)
+        for indexes, state in self.tileCells[tile].items():
+            if state not in colors:
+                colors[state] = self.model.getCellColor(*state).rgba()  # get color from the model, based on cell state
+            pixels[indexes[1] - tile[1] * self.tileSize, indexes[0] - tile[0] * self.tileSize] = colors[state]
 
-        for indexes, cell in currentBoard.items():
-            i = indexes[0]
-            j = indexes[1]
-            pos = self.mapToScene(i * self.cellSize, j * self.cellSize)
-            color = self.model.getColor(cell.getState())  # get color from the model, based on cell state
-            self.scene.addRect(pos.x(), pos.y(), self.cellSize,
-                               self.cellSize, QPen(color), QBrush(color))  # each cell is represented as square
+        return QImage(pixels.tobytes(), self.tileSize, self.tileSize, 4 * self.tileSize, QImage.Format_ARGB32).copy()
+
+    def drawBackground(self, painter, rect):
+        """ Paints the visible tiles, rendering the ones which are not in the cache. Each cell is represented as a square,
+        scaled from a single pixel of the tile image without smoothing """
+        super().drawBackground(painter, rect)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+
+        txMin = max(int(rect.left()) // self.tileSize, 0)
+        tyMin = max(int(rect.top()) // self.tileSize, 0)
+        txMax = int(rect.right()) // self.tileSize
+        tyMax = int(rect.bottom()) // self.tileSize
+
+        # empty tiles are just the background: when zoomed out there are many more visible tiles than non-empty ones
+        if (txMax - txMin + 1) * (tyMax - tyMin + 1) > len(self.tileCells):
+            tiles = [(tx, ty) for (tx, ty) in self.tileCells.keys() if txMin <= tx <= txMax and tyMin <= ty <= tyMax]
+        else:
+            tiles = [(tx, ty) for tx in range(txMin, txMax + 1) for ty in range(tyMin, tyMax + 1)
+                     if (tx, ty) in self.tileCells]
+
+        for (tx, ty) in tiles:
+            if (tx, ty) not in self.tileImages:
+                self.tileImages[(tx, ty)] = self.renderTile((tx, ty))
+            target = QRectF(tx * self.tileSize, ty * self.tileSize, self.tileSize, self.tileSize)
+            painter.drawImage(target, self.tileImages[(tx, ty)])
 
     def changeSizes(self):
         """ When the cell size is modified this method is called, we get the new cellSize value
-        and we re-render the board."""
+        and we scale the View accordingly, keeping the position under the mouse still. The tiles are not redrawn."""
         self.cellSize = self.model.getCellSize()
-        self.renderBoard()
-
-    def scrollContentsBy(self, dx, dy):
-        """ "puppet" class to avoid scrolling in the View """
-        pass
+        self.setTransform(QTransform.fromScale(self.cellSize, self.cellSize))
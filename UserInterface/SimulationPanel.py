@@ -7,7 +7,7 @@ from PyQt5.QtCore import Qt
 class SimulationPanel(QHBoxLayout):
     """
     Simulation Panel: presents the user the simulation controllers: play/pause/reset, speed settings and
-    options to navigate the history of the board (arrows left/right).
+    options to navigate the history of the board (arrows left/right and the generation slider).
 
     Parameters:
     model (CheckboardModel): the model, in order to make use of primitives to control the simulation
@@ -21,6 +21,7 @@ class SimulationPanel(QHBoxLayout):
 
         self.model = model
         self.model.observeBoard(self.alignArrowStatus)  # To keep arrow status aligned with current status
+        self.model.observeBoard(self.alignGeneration)  # To keep the generation slider aligned with current status
 
         # Arrow-Left
         self._left = QPushButton(QIcon("./Icons/iconmonstr-arrow-left.svg"), "")
@@ -53,6 +54,16 @@ class SimulationPanel(QHBoxLayout):
         self._speed.setValue(self.model.getSpeed())
         self._speed.valueChanged[int].connect(self.sliderModified)
 
+        # Generation slider: to jump directly to any generation in the board history
+        self._generation = QSlider(Qt.Horizontal)
+        self._generation.setMinimumSize(150, 30)
+        self._generation.setMinimum(0)
+        self._generation.setMaximum(self.model.getLastGeneration())
+        self._generation.setValue(self.model.getGeneration())
+        self._generation.valueChanged[int].connect(self.generationModified)
+        self._generationLabel = QLabel()
+        self._generationLabel.setMinimumSize(60, 30)
+
         # Reset
         self._reset = QPushButton("Reset")
         self._reset.clicked.connect(self.clickReset)
@@ -63,12 +74,17 @@ class SimulationPanel(QHBoxLayout):
         self.addWidget(self._right)
         self.addWidget(self._pause)
         self.addWidget(self._play)
+        self.addWidget(QLabel("Generation:"))
+        self.addWidget(self._generation)
+        self.addWidget(self._generationLabel)
         self.addStretch()
         self.addWidget(QLabel("Speed:"))
         self.addWidget(self._speed)
         self.addStretch()
         self.addWidget(self._reset)
 
+        self.alignGeneration()
+
     def clickLeft(self):
         """ On a click to Arrow-Lef we go to the previous configuration in the board history
         (if this is not possible this button is not active thanks to alignArrowStatus,
@@ -87,6 +103,19 @@ class SimulationPanel(QHBoxLayout):
         self._left.setEnabled(self.model.getLeftEnabled())
         self._right.setEnabled(self.model.getRightEnabled())
 
+    def alignGeneration(self):
+        """ Method connected to board update in the model, aligns the generation slider to the length of the
+        board history and to the generation which is displayed now """
+        self._generation.blockSignals(True)  # the slider is moved by the model: we don't have to notify it back
+        self._generation.setMaximum(self.model.getLastGeneration())
+        self._generation.setValue(self.model.getGeneration())
+        self._generation.blockSignals(False)
+        self._generationLabel.setText(str(self.model.getGeneration()))
+
+    def generationModified(self, value):
+        """ When the generation slider is modified we jump to the selected generation in the board history """
+        self.model.goTo(value)
+
     def clickPause(self):
         """ On a click to Pause button we pause the game, disable this button and enable the play button """
         self.model.pause()
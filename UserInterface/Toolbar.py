@@ -1,22 +1,28 @@
-from PyQt5.QtWidgets import QMessageBox, QAction, QFileDialog, QApplication, QMenu, QMenuBar, QHBoxLayout
+from PyQt5.QtWidgets import QMessageBox, QAction, QFileDialog, QApplication, QMenu, QMenuBar, QHBoxLayout, QInputDialog, \
+    QProgressDialog
 from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt
+
+from Model.GameExporter import GameExporter
 
 
 # 1) Toolbar()
 class Toolbar(QHBoxLayout):
     """
-    Toolbar: presents the user the save, load and help funtionalities
+    Toolbar: presents the user the save, load, export and help funtionalities
 
     Parameters:
     model (CheckboardModel): the model, in order to make use of primitives to save/load Games
+    grid  (GameGrid): the view, in order to export the region of the board which is visible
 
     """
 
-    def __init__(self, model, ** kwargs):
+    def __init__(self, model, grid, ** kwargs):
         """ Generates the toolbar layout and connects each button to the corresponding action """
 
         super().__init__(**kwargs)
         self.model = model
+        self.grid = grid
         self._menu_bar = QMenuBar()
 
         self._file = QMenu("&File")
@@ -30,6 +36,10 @@ class Toolbar(QHBoxLayout):
         self._load.triggered.connect(self.loadAction)
         self._file.addAction(self._load)
 
+        self._export = QAction("Export...")
+        self._export.triggered.connect(self.exportAction)
+        self._file.addAction(self._export)
+
         self._file.addSeparator()
 
         self._quit = QAction("Quit")
@@ -52,6 +62,54 @@ class Toolbar(QHBoxLayout):
         file = QFileDialog.getOpenFileName(caption="Load Game", filter="Game of Life (*.gol)")
         self.model.loadGame(file[0])
 
+    def exportAction(self, maxFrameSize=2048):
+        """ Export action: displays dialogs to gather the file name and the last generation to export, then exports
+        the game from the first generation with the current colors, limited to the region visible in the GameGrid and
+        with its cell size (at least one pixel per cell). Frames larger than maxFrameSize pixels per side are not
+        exported, and only the formats whose packages are installed are offered.
+        A progress dialog lets the user follow and stop the export """
+        region = self.grid.getVisibleRegion()
+        cellSize = max(1, round(self.grid.cellSize))
+        width, height = (region[2] - region[0]) * cellSize, (region[3] - region[1]) * cellSize
+        if width > maxFrameSize or height > maxFrameSize:
+            QMessageBox.warning(None, "Export Game", "The visible region would need frames of " + str(width) + "x" + str(height) +
+                                " pixels: zoom in to export at most " + str(maxFrameSize) + " pixels per side.")
+            return
+
+        formats = GameExporter.availableFormats()
+        filters = {name: extension for name, extension in
+                   {"Animated GIF (*.gif)": ".gif", "PNG sequence (*.png)": ".png", "Video (*.mp4)": ".mp4"}.items()
+                   if extension in formats}
+        file = QFileDialog.getSaveFileName(caption="Export Game", filter=";;".join(filters.keys()))
+        if file[0] == "":
+            return
+        filename = file[0]
+        if not filename.lower().endswith(filters[file[1]]):
+            filename += filters[file[1]]
+
+        end, ok = QInputDialog.getInt(None, "Export Game", "Last generation to export:",
+                                      value=max(self.model.getLastGeneration(), 100), min=0, max=10000)
+        if not ok:
+            return
+
+        progressDialog = QProgressDialog("Exporting...", "Stop", 0, end + 1)
+        progressDialog.setWindowTitle("Export Game")
+        progressDialog.setWindowModality(Qt.ApplicationModal)
+        progressDialog.setMinimumDuration(0)
+
+        def progress(gen):
+            """ Updates the progress dialog and keeps the interface responsive: returns False if the export was stopped """
+            progressDialog.setValue(gen)
+            QApplication.processEvents()
+            return not progressDialog.wasCanceled()
+
+        try:
+            GameExporter(self.model, cellSize=cellSize, fps=self.model.getSpeed()).export(filename, 0, end, region, progress)
+        except (ImportError, OSError) as error:
+            QMessageBox.warning(None, "Export Game", "The game could not be exported: " + str(error))
+        finally:
+            progressDialog.setValue(end + 1)
+
     def quitAction(self):
         """ Quit action: calls the QApplication exit method """
         QApplication.exit()
@@ -78,6 +136,8 @@ class HelpDialog(QMessageBox):
                                 + "<h3>Commands:</h3>"
                                 + "<li> <b>Left Click:</b> add cells"
                                 + "<li> <b>Right Click:</b> remove cells"
+                                + "<li> <b>Middle Click drag:</b> move over the board"
+                                + "<li> <b>Mouse Wheel:</b> zoom in/out"
                                 + "<li> <b>Enter over Cell Size:</b> update cell size")
 
         self.exec_()
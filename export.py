@@ -0,0 +1,41 @@
+import argparse
+
+from Model.CheckboardModel import CheckboardModel
+from Model.GameExporter import GameExporter
+
+
+def parseArguments():
+    """ Parses the command line arguments of the headless export """
+    parser = argparse.ArgumentParser(description="Exports a Game of Life run to an animated GIF, a PNG sequence or a video, "
+                                                 "without opening the application window.")
+    parser.add_argument("game", help="the .gol file to load")
+    parser.add_argument("output", help="the output file: .gif, .png (sequence) or a video format such as .mp4")
+    parser.add_argument("--start", type=int, default=0, help="first generation to export (default: 0)")
+    parser.add_argument("--end", type=int, default=100, help="last generation to export (default: 100)")
+    parser.add_argument("--cell-size", type=int, default=4, help="side of each cell in pixels (default: 4)")
+    parser.add_argument("--fps", type=int, default=10, help="frames per second of GIF and video files (default: 10)")
+    parser.add_argument("--region", type=int, nargs=4, metavar=("X0", "Y0", "X1", "Y1"),
+                        help="part of the board to render, X1 and Y1 excluded (default: the cells of the first generation, "
+                             "enlarged by the margin)")
+    parser.add_argument("--margin", type=int, default=50, help="cells added on each side of the default region (default: 50)")
+    return parser.parse_args()
+
+
+def main():
+    """ Loads the game in the model and exports the requested generations: no QApplication is needed, as the frames
+    are rendered straight from the boards """
+    args = parseArguments()
+
+    model = CheckboardModel()
+    model.loadGame(args.game)
+
+    exporter = GameExporter(model, cellSize=args.cell_size, fps=args.fps)
+    if args.region is not None:
+        region = tuple(args.region)
+    else:
+        region = exporter.boundingBox(next(model.getBoards(args.start, args.start)), args.margin)
+    exporter.export(args.output, args.start, args.end, region)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,17 +40,17 @@ class App(QApplication):
         self._root = QWidget()
         self._layout = QVBoxLayout()
 
+        # 3) GameGrid() is created first, as the Toolbar() exports the region visible in it
+        self._game_grid = GameGrid(self._model)
+
         # 1) Toolbar()
         self._toolbar = QWidget()
-        self._toolbar.setLayout(Toolbar(self._model))
+        self._toolbar.setLayout(Toolbar(self._model, self._game_grid))
 
         # 2) ConfigPanel()
         self._config = QWidget()
         self._config.setLayout(ConfigPanel(self._model))
 
-        # 3) GameGrid()
-        self._game_grid = GameGrid(self._model)
-
         # 4) SimulationPanel()
         self._simulation_panel = QWidget()
         self._simulation_panel.setLayout(SimulationPanel(self._model))